@@ -1,26 +1,284 @@
+import atexit
+import bisect
+import csv
+import functools
 import json
+import logging
+import mmap
+import operator
 import os
+import pickle
+import re
+import shutil
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter, Retry
+except ImportError:
+    requests = None
+
+logger = logging.getLogger(__name__)
 
 DATABASE_FILE = "record_collection.json"
+LOG_FILE = DATABASE_FILE + ".log"
+CACHE_FILE = DATABASE_FILE + ".cache.pkl"
 HTML_FILE = "record_collection.html"
+COVERS_DIR = "covers"
+ITUNES_SEARCH_URL = "https://itunes.apple.com/search"
+
+# Monotonic counter bumped on every mutation of the collection. Derived
+# data (like the rendered HTML export) is cached keyed on this version,
+# so it only needs recomputing after an actual change.
+_collection_version = 0
+_html_cache = {}
+
+# True whenever the in-memory collection has mutations not yet compacted
+# into the base database file (they are still covered by the log).
+_dirty = False
+
+def _bump_collection_version():
+    """Records that the collection changed, invalidating cached renders."""
+    global _collection_version, _dirty
+    _collection_version += 1
+    _dirty = True
+
+def flush_collection(collection):
+    """Compacts the collection to disk if there are unsaved changes.
+
+    Registered as an exit hook by main(), so burst mutations coalesce
+    into a single save instead of one rewrite each, and quitting without
+    choosing 'Save and Exit' still leaves a compacted database.
+    """
+    if _dirty:
+        save_collection(collection)
+
+def _loads(data):
+    """Parses JSON bytes, preferring orjson's C parser when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _dumps(collection):
+    """Serializes the collection to compact JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(collection)
+    # ensure_ascii=False keeps non-ASCII artists/albums as raw UTF-8,
+    # matching orjson's output instead of inflating them to \uXXXX.
+    return json.dumps(collection, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+_RECORD_FIELDS = ("artist", "album", "genre", "year", "format", "notes", "cover_path")
+
+def _intern_record_fields(record):
+    """Interns a record's low-cardinality fields.
+
+    Genre, format, and year repeat across most of a collection; interning
+    makes every repeat share a single string object (and lets equality
+    checks short-circuit on identity).
+    """
+    for field in ('genre', 'format', 'year'):
+        value = record.get(field)
+        if isinstance(value, str):
+            record[field] = sys.intern(value)
+    return record
+
+def _append_log(entry):
+    """Appends one mutation to the newline-delimited JSON log.
+
+    Each add/edit/delete writes a single line instead of rewriting the
+    whole database file, so mutations are durable at O(1) cost. The log
+    is replayed on load and truncated when save_collection compacts.
+    """
+    with open(LOG_FILE, 'ab') as f:
+        f.write(_dumps(entry) + b"\n")
+
+# Once this many mutations pile up in the log, load_collection compacts
+# them into the base file so replay time stays bounded.
+_LOG_COMPACT_THRESHOLD = 1000
+
+def _replay_log(collection):
+    """Applies any logged mutations on top of the loaded collection.
+
+    Returns the collection and the number of entries replayed.
+    """
+    if not os.path.exists(LOG_FILE):
+        return collection, 0
+    replayed = 0
+    with open(LOG_FILE, 'rb') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = _loads(line)
+            except ValueError:
+                # A crash mid-append can leave a truncated last line;
+                # everything before it is still good.
+                continue
+            replayed += 1
+            op = entry.get("op")
+            if op == "add":
+                collection.append(_intern_record_fields(entry["record"]))
+            elif op == "upd":
+                index = entry["index"]
+                if 0 <= index < len(collection):
+                    collection[index] = _intern_record_fields(entry["record"])
+            elif op == "del":
+                index = entry["index"]
+                if 0 <= index < len(collection):
+                    collection.pop(index)
+            elif op == "sort":
+                collection.sort(key=lambda record: record['artist'].lower())
+    return collection, replayed
+
+def _load_parse_cache(stat_key):
+    """Returns the cached parse of the database file, or None on miss."""
+    try:
+        with open(CACHE_FILE, 'rb') as f:
+            cached_key, collection = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+        return None
+    if cached_key != stat_key:
+        return None
+    return collection
+
+def _write_parse_cache(stat_key, collection):
+    """Stores the parsed collection in the sidecar cache, atomically."""
+    tmp_file = CACHE_FILE + ".tmp"
+    try:
+        with open(tmp_file, 'wb') as f:
+            pickle.dump((stat_key, collection), f, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, CACHE_FILE)
+    except OSError:
+        pass  # the cache is best-effort only
+
+# Files smaller than this parse faster via a plain read; mmap setup
+# overhead only pays off on bigger databases.
+_MMAP_MIN_SIZE = 64 * 1024
+
+def _parse_database_file(f, size):
+    """Parses the open database file.
+
+    Large files are memory-mapped and handed to orjson, which accepts
+    any buffer object — no copy of the file into a Python bytes object,
+    and the page cache is shared. Small files, and the stdlib fallback
+    (which requires real bytes), use an ordinary read.
+    """
+    if orjson is not None and size >= _MMAP_MIN_SIZE:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                return orjson.loads(view)
+            finally:
+                # The buffer must be released before the mmap can close.
+                view.release()
+    return _loads(f.read())
 
 def load_collection():
-    """Loads the record collection from the JSON file."""
+    """Loads the record collection from the JSON file plus mutation log.
+
+    A pickle sidecar caches the parsed database keyed on the file's
+    (mtime, size), so restarting against an unchanged file skips the
+    JSON parse entirely.
+    """
+    collection = []
     if os.path.exists(DATABASE_FILE):
-        with open(DATABASE_FILE, 'r') as f:
-            try:
-                return json.load(f)
-            except json.JSONDecodeError:
-                print("Error: Could not decode the database file. Starting with an empty collection.")
-                return []
-    return []
+        stat = os.stat(DATABASE_FILE)
+        stat_key = (stat.st_mtime, stat.st_size)
+        collection = _load_parse_cache(stat_key)
+        if collection is None:
+            with open(DATABASE_FILE, 'rb') as f:
+                try:
+                    collection = _parse_database_file(f, stat.st_size)
+                except ValueError:
+                    print("Error: Could not decode the database file. Starting with an empty collection.")
+                    collection = []
+            if collection:
+                _write_parse_cache(stat_key, collection)
+    for record in collection:
+        for field in _RECORD_FIELDS:
+            record.setdefault(field, "")
+        _intern_record_fields(record)
+    collection, replayed = _replay_log(collection)
+    if replayed >= _LOG_COMPACT_THRESHOLD:
+        # Fold a long log back into the base file so future loads do not
+        # replay it all again.
+        _write_database(collection)
+    return collection
 
 def save_collection(collection):
-    """Saves the record collection to the JSON file."""
-    with open(DATABASE_FILE, 'w') as f:
-        json.dump(collection, f, indent=4)
+    """Saves the record collection to the JSON file.
+
+    Writes to a temporary file first and atomically replaces the database
+    file, so a crash mid-write can never truncate the collection. The JSON
+    is written compactly to keep the file (and each rewrite) small.
+    """
+    _write_database(collection)
+    _save_cover_index()
     print("Collection saved successfully!")
 
+def _write_database(collection):
+    """Compacts the collection into the base file, clearing log and cache."""
+    # Empty fields (usually notes) are omitted on disk — they would
+    # repeat the same '"notes":""' bytes for most of the collection —
+    # and restored as defaults by load_collection.
+    slim = [{key: value for key, value in record.items() if value}
+            for record in collection]
+    tmp_file = DATABASE_FILE + ".tmp"
+    with open(tmp_file, 'wb') as f:
+        f.write(_dumps(slim))
+    os.replace(tmp_file, DATABASE_FILE)
+    # The database file now holds everything; the replayed mutations in
+    # the log are compacted into it and the log can go.
+    try:
+        os.remove(LOG_FILE)
+    except FileNotFoundError:
+        pass
+    # The parse cache describes the old file contents; drop it so the
+    # next load re-parses (and re-caches) the fresh database.
+    try:
+        os.remove(CACHE_FILE)
+    except FileNotFoundError:
+        pass
+    global _dirty
+    _dirty = False
+
+def _extend_search_caches(record, row, old_version):
+    """Advances the lazy search caches in place after an append.
+
+    Appending one record only adds one entry per cache, so caches that
+    were current before the mutation are updated in O(1) instead of
+    being thrown away for a full O(N) rebuild on the next search. The
+    concatenated scan buffers are the exception — they cannot grow
+    without copying, so they stay lazily rebuilt.
+    """
+    global _lower_columns_version, _year_index_version, _token_index_version
+    if _lower_columns is not None and _lower_columns_version == old_version:
+        for field in ('artist', 'album', 'genre'):
+            _lower_columns[field].append(record[field].lower())
+        _lower_columns_version = _collection_version
+    if _year_index is not None and _year_index_version == old_version:
+        _year_index.setdefault(record['year'], []).append(row)
+        _year_index_version = _collection_version
+    if _token_index is not None and _token_index_version == old_version:
+        for field in ('artist', 'album', 'genre'):
+            for token in _WORD_RE.findall(record[field].lower()):
+                _token_index.setdefault(token, set()).add(row)
+        _token_index_version = _collection_version
+    global _artist_sorted_version
+    if (_artist_sorted_idx is not None and _artist_sorted_version == old_version
+            and _lower_columns_version == _collection_version):
+        bisect.insort(_artist_sorted_idx, row,
+                      key=_lower_columns['artist'].__getitem__)
+        _artist_sorted_version = _collection_version
+
 def add_record(collection):
     """Adds a new record to the collection."""
     artist = input("Enter artist: ").strip()
@@ -30,33 +288,327 @@ def add_record(collection):
     format = input("Enter format (LP, 7\", CD, etc.): ").strip()
     notes = input("Enter any notes (optional): ").strip()
 
-    record = {
+    record = _intern_record_fields({
         "artist": artist,
         "album": album,
         "genre": genre,
         "year": year,
         "format": format,
-        "notes": notes
-    }
+        "notes": notes,
+        "cover_path": ""
+    })
     collection.append(record)
+    _append_log({"op": "add", "record": record})
+    old_version = _collection_version
+    _bump_collection_version()
+    _extend_search_caches(record, len(collection) - 1, old_version)
     print(f"Added '{album}' by {artist} to your collection.")
 
+def add_records_bulk(collection):
+    """Imports many records at once from pasted CSV lines.
+
+    Each line holds artist,album,genre,year,format,notes (trailing
+    fields optional); input ends at a blank line or EOF. A batch import
+    costs one pass over the lines instead of six prompts per record.
+    """
+    print("Paste CSV lines as: artist,album,genre,year,format,notes")
+    print("Finish with an empty line.")
+    lines = []
+    while True:
+        try:
+            line = input()
+        except EOFError:
+            break
+        if not line.strip():
+            break
+        lines.append(line)
+
+    added = 0
+    for row in csv.reader(lines):
+        fields = [field.strip() for field in row[:6]]
+        if not any(fields):
+            continue
+        fields += [""] * (6 - len(fields))
+        record = dict(zip(("artist", "album", "genre", "year", "format", "notes"), fields))
+        record["cover_path"] = ""
+        record = _intern_record_fields(record)
+        collection.append(record)
+        _append_log({"op": "add", "record": record})
+        old_version = _collection_version
+        _bump_collection_version()
+        _extend_search_caches(record, len(collection) - 1, old_version)
+        added += 1
+    print(f"Added {added} records to your collection.")
+
 def view_collection(collection):
     """Displays the entire record collection."""
     if not collection:
         print("Your collection is empty.")
         return
 
-    print("\n--- Your Record Collection ---")
+    # Collect output and write it in large chunks; a print() per line
+    # means thousands of tiny writes on a large collection, while one
+    # giant join would hold the whole dump in memory. Flushing every
+    # 1000 records keeps both in check.
+    parts = ["\n--- Your Record Collection ---\n"]
     for i, record in enumerate(collection):
-        print(f"{i+1}. Artist: {record['artist']}")
-        print(f"   Album: {record['album']}")
-        print(f"   Genre: {record['genre']}")
-        print(f"   Year: {record['year']}")
-        print(f"   Format: {record['format']}")
+        parts.append(f"{i+1}. Artist: {record['artist']}\n")
+        parts.append(f"   Album: {record['album']}\n")
+        parts.append(f"   Genre: {record['genre']}\n")
+        parts.append(f"   Year: {record['year']}\n")
+        parts.append(f"   Format: {record['format']}\n")
         if record['notes']:
-            print(f"   Notes: {record['notes']}")
-        print("-" * 20)
+            parts.append(f"   Notes: {record['notes']}\n")
+        parts.append("-" * 20 + "\n")
+        if (i + 1) % 1000 == 0:
+            sys.stdout.write("".join(parts))
+            parts = []
+    if parts:
+        sys.stdout.write("".join(parts))
+
+# Lowercased per-field column lists (structure-of-arrays) used by search.
+# Rebuilt lazily when the collection version changes, so repeated searches
+# reuse the same precomputed strings instead of calling .lower() on every
+# record for every query.
+_lower_columns = None
+_lower_columns_version = -1
+
+def _get_lower_columns(collection):
+    """Returns {field: [lowercased values]} columns for the collection."""
+    global _lower_columns, _lower_columns_version
+    if _lower_columns is None or _lower_columns_version != _collection_version:
+        _lower_columns = {
+            'artist': [record['artist'].lower() for record in collection],
+            'album': [record['album'].lower() for record in collection],
+            'genre': [record['genre'].lower() for record in collection],
+        }
+        _lower_columns_version = _collection_version
+    return _lower_columns
+
+# Exact-year lookups go through a dict index instead of scanning rows.
+_year_index = None
+_year_index_version = -1
+
+def _get_year_index(collection):
+    """Returns {year: [row numbers]} for the collection."""
+    global _year_index, _year_index_version
+    if _year_index is None or _year_index_version != _collection_version:
+        index = {}
+        for i, record in enumerate(collection):
+            index.setdefault(record['year'], []).append(i)
+        _year_index = index
+        _year_index_version = _collection_version
+    return _year_index
+
+# Row numbers ordered by lowercased artist name, kept incrementally via
+# bisect on appends so sorting does not restart from scratch every time.
+_artist_sorted_idx = None
+_artist_sorted_version = -1
+
+def _get_artist_sorted_indices(collection):
+    """Returns row numbers of the collection ordered by artist name."""
+    global _artist_sorted_idx, _artist_sorted_version
+    if _artist_sorted_idx is None or _artist_sorted_version != _collection_version:
+        column = _get_lower_columns(collection)['artist']
+        _artist_sorted_idx = sorted(range(len(collection)), key=column.__getitem__)
+        _artist_sorted_version = _collection_version
+    return _artist_sorted_idx
+
+# Inverted index: every word appearing in an artist/album/genre field
+# maps to the set of rows containing it. Powers whole-word keyword
+# search without scanning the collection.
+_WORD_RE = re.compile(r'\w+')
+_token_index = None
+_token_index_version = -1
+
+def _get_token_index(collection):
+    """Returns {word: set[row numbers]} over artist/album/genre fields."""
+    global _token_index, _token_index_version
+    if _token_index is None or _token_index_version != _collection_version:
+        index = {}
+        for column in _get_lower_columns(collection).values():
+            for i, value in enumerate(column):
+                for token in _WORD_RE.findall(value):
+                    index.setdefault(token, set()).add(i)
+        _token_index = index
+        _token_index_version = _collection_version
+    return _token_index
+
+# Below this size a parallel scan costs more in thread plumbing than the
+# scan itself; above it the chunks are worth farming out.
+_PARALLEL_SCAN_THRESHOLD = 10_000
+
+def _regex_scan_all_fields(collection, query):
+    """Substring-matches the query against every searchable field.
+
+    The query is compiled once into a case-insensitive regex, so the
+    per-record matching runs in the C regex engine rather than through
+    repeated Python-level .lower()/in pairs. Collections past the
+    parallel threshold are split into per-core slices scanned by a
+    thread pool, preserving order.
+    """
+    pattern = re.compile(re.escape(query), re.IGNORECASE)
+    search = pattern.search
+
+    def scan(records):
+        return [record for record in records
+                if search(record['artist']) or search(record['album'])
+                or search(record['genre'])]
+
+    if len(collection) <= _PARALLEL_SCAN_THRESHOLD:
+        return scan(collection)
+    workers = os.cpu_count() or 1
+    chunk_size = -(-len(collection) // workers)
+    slices = [collection[i:i + chunk_size]
+              for i in range(0, len(collection), chunk_size)]
+    results = []
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for matched in executor.map(scan, slices):
+            results.extend(matched)
+    return results
+
+def search_collection_keywords(collection, query):
+    """Finds records matching the query in any field.
+
+    Whole-word queries are answered from the inverted index: each query
+    word's posting set is intersected, so the work is proportional to
+    the matching rows rather than the collection size. Queries with
+    partial words (tokens the index does not know) fall back to a
+    compiled-regex substring scan of all fields.
+    """
+    tokens = _WORD_RE.findall(query.lower())
+    if not tokens:
+        return []
+    index = _get_token_index(collection)
+    postings = [index.get(token) for token in tokens]
+    if not all(postings):
+        return _regex_scan_all_fields(collection, query)
+    candidates = set.intersection(*postings)
+    return [collection[i] for i in sorted(candidates)]
+
+# Per-field concatenated search buffers. Each field's lowercased values
+# are joined into one string with NUL separators; a substring query is
+# then a single C-level str.find scan over that buffer instead of a
+# Python-level loop over rows. Match positions map back to row numbers
+# through the offsets list via bisect.
+_FIELD_SEP = '\x00'
+_search_buffers = None
+_search_buffers_version = -1
+
+def _get_search_buffers(collection):
+    """Returns {field: (buffer, row_offsets)} for the collection."""
+    global _search_buffers, _search_buffers_version
+    if _search_buffers is None or _search_buffers_version != _collection_version:
+        buffers = {}
+        for field, column in _get_lower_columns(collection).items():
+            offsets = []
+            position = 0
+            for value in column:
+                offsets.append(position)
+                position += len(value) + 1
+            buffers[field] = (_FIELD_SEP.join(column) + _FIELD_SEP, offsets)
+        _search_buffers = buffers
+        _search_buffers_version = _collection_version
+    return _search_buffers
+
+def _scan_field(collection, field, term):
+    """Returns records whose field contains term, via one buffer scan.
+
+    A match can never span two rows because the separator is a NUL
+    character, which cannot appear in the search term.
+    """
+    if _FIELD_SEP in term:
+        return []
+    buffer, offsets = _get_search_buffers(collection)[field]
+    results = []
+    position = buffer.find(term)
+    while position != -1:
+        row = bisect.bisect_right(offsets, position) - 1
+        results.append(collection[row])
+        # Resume at the next row boundary so several hits inside one
+        # value do not duplicate the record.
+        next_row = row + 1
+        if next_row == len(offsets):
+            break
+        position = buffer.find(term, offsets[next_row])
+    return results
+
+def _emit(*lines):
+    """Writes several output lines as a single stdout write."""
+    sys.stdout.write("\n".join(lines) + "\n")
+
+def _yes(prompt):
+    """Returns True for a y/Y answer; anything else means no.
+
+    The [:1] slice accepts 'y'/'yes' alike without allocating a
+    stripped+lowered copy of the whole answer.
+    """
+    return input(prompt)[:1].lower() == 'y'
+
+# Memoized search results: browsing users re-issue the same query, and a
+# repeat costs one dict lookup. Keyed on (choice, term), emptied on any
+# collection change and bounded so a long session cannot grow it forever.
+_search_cache = {}
+_search_cache_version = -1
+
+def _run_search(collection, choice, search_term):
+    """Executes one search-menu query against the collection."""
+    if choice == '1':
+        return _scan_field(collection, 'artist', search_term)
+    if choice == '2':
+        return _scan_field(collection, 'album', search_term)
+    if choice == '3':
+        return _scan_field(collection, 'genre', search_term)
+    if choice == '4':
+        return [collection[i] for i in _get_year_index(collection).get(search_term, [])]
+    return search_collection_keywords(collection, search_term)
+
+def _cached_search(collection, choice, search_term):
+    """Returns (and remembers) the results for one search-menu query."""
+    global _search_cache_version
+    if _search_cache_version != _collection_version:
+        _search_cache.clear()
+        _search_cache_version = _collection_version
+    key = (choice, search_term)
+    results = _search_cache.get(key)
+    if results is None:
+        if len(_search_cache) >= 128:
+            _search_cache.clear()
+        results = _run_search(collection, choice, search_term)
+        _search_cache[key] = results
+    return results
+
+# Formatted record blocks keyed by object identity; any mutation bumps
+# the collection version and empties the cache, so a record edited in
+# place can never serve stale text. Bounded like the search cache.
+_format_cache = {}
+_format_cache_version = -1
+
+def _render_record_text(record):
+    lines = [f"Artist: {record['artist']}",
+             f"Album: {record['album']}",
+             f"Genre: {record['genre']}",
+             f"Year: {record['year']}",
+             f"Format: {record['format']}"]
+    if record['notes']:
+        lines.append(f"Notes: {record['notes']}")
+    lines.append("-" * 20)
+    return "\n".join(lines)
+
+def format_record(record):
+    """Formats one record as the multi-line block shown in listings."""
+    global _format_cache_version
+    if _format_cache_version != _collection_version:
+        _format_cache.clear()
+        _format_cache_version = _collection_version
+    key = id(record)
+    text = _format_cache.get(key)
+    if text is None:
+        if len(_format_cache) >= 1024:
+            _format_cache.clear()
+        text = _render_record_text(record)
+        _format_cache[key] = text
+    return text
 
 def search_collection(collection):
     """Searches the collection based on different criteria."""
@@ -64,63 +616,101 @@ def search_collection(collection):
         print("Your collection is empty.")
         return
 
-    print("\n--- Search Options ---")
-    print("1. Search by Artist")
-    print("2. Search by Album Title")
-    print("3. Search by Genre")
-    print("4. Search by Year")
+    _emit("\n--- Search Options ---",
+          "1. Search by Artist",
+          "2. Search by Album Title",
+          "3. Search by Genre",
+          "4. Search by Year",
+          "5. Keyword Search (all fields)")
     choice = input("Enter your choice: ").strip()
 
-    results = []
     search_term = input("Enter your search term: ").strip().lower()
 
-    if choice == '1':
-        results = [record for record in collection if search_term in record['artist'].lower()]
-    elif choice == '2':
-        results = [record for record in collection if search_term in record['album'].lower()]
-    elif choice == '3':
-        results = [record for record in collection if search_term in record['genre'].lower()]
-    elif choice == '4':
-        results = [record for record in collection if search_term == record['year']]
-    else:
+    if choice not in ('1', '2', '3', '4', '5'):
         print("Invalid choice.")
         return
+    results = _cached_search(collection, choice, search_term)
 
     if results:
-        print("\n--- Search Results ---")
-        for record in results:
-            print(f"Artist: {record['artist']}")
-            print(f"Album: {record['album']}")
-            print(f"Genre: {record['genre']}")
-            print(f"Year: {record['year']}")
-            print(f"Format: {record['format']}")
-            if record['notes']:
-                print(f"Notes: {record['notes']}")
-            print("-" * 20)
+        sys.stdout.write("\n--- Search Results ---\n"
+                         + "\n".join(format_record(record) for record in results)
+                         + "\n")
     else:
         print("No records found matching your search term.")
 
+def find_record_by_index(collection, index):
+    """Returns the record at the given index, or None if out of range."""
+    if 0 <= index < len(collection):
+        return collection[index]
+    return None
+
+def _read_record_index(collection, prompt):
+    """Reads a 1-based record number, returning its index or None.
+
+    The parse-and-bounds-check dance is shared by every menu that asks
+    the user to pick a record, so the error messages stay uniform.
+    """
+    index_str = input(prompt).strip()
+    # Cheap predicate instead of try/int/except: a typo costs one branch
+    # rather than an exception unwind with frame and traceback setup.
+    if not index_str.isdigit():
+        print("Invalid input. Please enter a number.")
+        return None
+    index = int(index_str) - 1
+    if find_record_by_index(collection, index) is None:
+        print("Invalid record number.")
+        return None
+    return index
+
+def _prompt_for_record_index(collection, action):
+    """Asks the user to pick a record, optionally narrowing by a search.
+
+    With a filter term, only the first 20 matching records are printed
+    (with their real record numbers) instead of dumping the entire
+    collection just to choose one. Returns the chosen index, or None if
+    the input was invalid.
+    """
+    query = input("Filter term to narrow the list (or press Enter to show all): ").strip()
+    if query:
+        match_ids = {id(record) for record in search_collection_keywords(collection, query)}
+        if not match_ids:
+            print("No records match that filter.")
+            return None
+        parts = []
+        for i, record in enumerate(collection):
+            if id(record) in match_ids:
+                parts.append(f"{i+1}. {record['artist']} - {record['album']}\n")
+                if len(parts) == 20:
+                    break
+        sys.stdout.write("".join(parts))
+    else:
+        view_collection(collection)
+    return _read_record_index(collection, f"Enter the number of the record you want to {action}: ")
+
+# Fields the edit prompt walks through, with their static prompt
+# prefixes built once instead of per keystroke round. cover_path is
+# deliberately absent: covers are managed by the download/delete menu.
+_EDITABLE_KEYS = ("artist", "album", "genre", "year", "format", "notes")
+_EDIT_PROMPTS = tuple(f"Enter new value for {key}" for key in _EDITABLE_KEYS)
+
 def edit_record(collection):
     """Edits an existing record in the collection."""
     if not collection:
         print("Your collection is empty.")
         return
 
-    view_collection(collection)
-    try:
-        index_to_edit = int(input("Enter the number of the record you want to edit: ")) - 1
-        if 0 <= index_to_edit < len(collection):
-            record = collection[index_to_edit]
-            print("\n--- Editing Record ---")
-            for key, value in record.items():
-                new_value = input(f"Enter new value for {key} (leave blank to keep '{value}'): ").strip()
-                if new_value:
-                    record[key] = new_value
-            print("Record updated successfully!")
-        else:
-            print("Invalid record number.")
-    except ValueError:
-        print("Invalid input. Please enter a number.")
+    index_to_edit = _prompt_for_record_index(collection, "edit")
+    if index_to_edit is None:
+        return
+    record = collection[index_to_edit]
+    print("\n--- Editing Record ---")
+    for key, prompt in zip(_EDITABLE_KEYS, _EDIT_PROMPTS):
+        new_value = input(f"{prompt} (leave blank to keep '{record[key]}'): ").strip()
+        if new_value:
+            record[key] = new_value
+    _append_log({"op": "upd", "index": index_to_edit, "record": record})
+    _bump_collection_version()
+    print("Record updated successfully!")
 
 def delete_record(collection):
     """Deletes a record from the collection."""
@@ -128,151 +718,595 @@ def delete_record(collection):
         print("Your collection is empty.")
         return
 
-    view_collection(collection)
-    try:
-        index_to_delete = int(input("Enter the number of the record you want to delete: ")) - 1
-        if 0 <= index_to_delete < len(collection):
-            deleted_record = collection.pop(index_to_delete)
-            print(f"Deleted '{deleted_record['album']}' by {deleted_record['artist']}.")
-        else:
-            print("Invalid record number.")
-    except ValueError:
-        print("Invalid input. Please enter a number.")
+    index_to_delete = _prompt_for_record_index(collection, "delete")
+    if index_to_delete is None:
+        return
+    record = collection[index_to_delete]
+    if not _yes(f"Delete '{record['album']}' by {record['artist']}? (y/n): "):
+        print("Deletion cancelled.")
+        return
+    collection.pop(index_to_delete)
+    cover_path = record.get("cover_path")
+    if cover_path:
+        # The record is gone either way; its cover file disappears in
+        # the background so the unlink never blocks the prompt.
+        _verified_covers.discard(cover_path)
+        _unlink_in_background(cover_path)
+    _append_log({"op": "del", "index": index_to_delete})
+    _bump_collection_version()
+    print(f"Deleted '{record['album']}' by {record['artist']}.")
+
+# Collection version as of the last artist sort; while it still
+# matches, choosing option 6 again has nothing to do.
+_sorted_version = -1
 
 def sort_collection_by_artist(collection):
-    """Sorts the record collection by artist name."""
+    """Sorts the record collection by artist name, in place."""
+    global _sorted_version
     if not collection:
         print("Your collection is empty.")
         return
-    # Use the sorted() function with a lambda function as the key.
-    # The lambda function extracts the artist name for comparison.
-    sorted_collection = sorted(collection, key=lambda record: record['artist'].lower())
+    if _sorted_version == _collection_version:
+        print("Collection is already sorted by artist name.")
+        return
+    # Materialize from the incrementally maintained sorted index: O(N)
+    # gather, no comparisons, instead of a full O(N log N) resort. The
+    # slice assignment keeps every alias (main loop, exit hook) valid.
+    collection[:] = [collection[i] for i in _get_artist_sorted_indices(collection)]
+    _append_log({"op": "sort"})
+    _bump_collection_version()
+    _sorted_version = _collection_version
     print("Collection sorted by artist name.")
-    return sorted_collection
+
+# --- Album cover downloads -------------------------------------------------
+
+# One keep-alive session shared by every iTunes query and artwork
+# download: connections (TCP + TLS) are pooled per host instead of being
+# re-established for each request.
+_session = None
+
+def _get_session():
+    """Returns the shared HTTP session, creating it on first use."""
+    global _session
+    if _session is None:
+        _session = requests.Session()
+        # pool_maxsize tracks the download worker count so concurrent
+        # fetches never queue behind an exhausted connection pool.
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32,
+                              max_retries=Retry(total=2, backoff_factor=0.3))
+        _session.mount("https://", adapter)
+        _session.mount("http://", adapter)
+    return _session
+
+# Characters that cannot appear in filenames are dropped and spaces
+# become underscores, all in one C-level translate pass.
+_FILENAME_TABLE = str.maketrans({c: None for c in '\\/*?:"<>|'} | {' ': '_'})
+
+def _sanitize_filename(name):
+    """Strips characters that cannot appear in filenames."""
+    return name.translate(_FILENAME_TABLE)[:100]
+
+# File removals run off the interactive path: on slow or network
+# storage a single unlink can stall the prompt, and nothing downstream
+# waits on the result. The pool is joined at interpreter exit.
+_io_pool = None
+
+def _safe_unlink(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+def _unlink_in_background(path):
+    """Queues a best-effort file removal on the shared I/O pool."""
+    global _io_pool
+    if _io_pool is None:
+        _io_pool = ThreadPoolExecutor(max_workers=2)
+    _io_pool.submit(_safe_unlink, path)
+
+# Cover paths confirmed present on disk this session.  A cover that was
+# seen once never pays another stat(); deletions discard their entry.
+_verified_covers = set()
+
+def _cover_exists(cover_path):
+    """Like os.path.exists, but remembers covers already seen on disk."""
+    if cover_path in _verified_covers:
+        return True
+    if os.path.exists(cover_path):
+        _verified_covers.add(cover_path)
+        return True
+    return False
+
+def _prime_verified_covers():
+    """Seeds the verified-cover set from one covers-directory scan.
+
+    Bulk passes (missing-cover scan, HTML export) would otherwise pay a
+    stat() per record on their first run; one directory read answers all
+    of them at once.
+    """
+    try:
+        with os.scandir(COVERS_DIR) as entries:
+            _verified_covers.update(os.path.join(COVERS_DIR, entry.name)
+                                    for entry in entries if entry.is_file())
+    except FileNotFoundError:
+        pass
+
+# Sidecar mapping sanitized base name -> saved cover path. It answers
+# "do we already have this cover?" without touching the network or
+# probing candidate extensions, and survives restarts on disk.
+_COVER_INDEX_FILE = os.path.join(COVERS_DIR, ".index.json")
+_cover_index = None
+_cover_index_dirty = False
+
+def _get_cover_index():
+    """Returns the cover filename index, loading the sidecar on first use."""
+    global _cover_index
+    if _cover_index is None:
+        try:
+            with open(_COVER_INDEX_FILE, 'rb') as f:
+                _cover_index = _loads(f.read())
+        except (FileNotFoundError, ValueError):
+            _cover_index = {}
+    return _cover_index
+
+def _record_cover_in_index(base_name, filepath):
+    global _cover_index_dirty
+    _get_cover_index()[base_name] = filepath
+    _cover_index_dirty = True
+
+def _save_cover_index():
+    """Flushes the cover index sidecar if it changed this session."""
+    global _cover_index_dirty
+    if not _cover_index_dirty:
+        return
+    os.makedirs(COVERS_DIR, exist_ok=True)
+    tmp_file = _COVER_INDEX_FILE + ".tmp"
+    with open(tmp_file, 'wb') as f:
+        f.write(_dumps(_cover_index))
+    os.replace(tmp_file, _COVER_INDEX_FILE)
+    _cover_index_dirty = False
+
+def _download_and_save_image(image_url, artist, album):
+    """Downloads artwork into the covers directory.
+
+    Returns the saved file path, or None if the download failed.
+    """
+    os.makedirs(COVERS_DIR, exist_ok=True)
+    base_name = _sanitize_filename(f"{artist}_{album}")
+    cached = _get_cover_index().get(base_name)
+    if cached and _cover_exists(cached):
+        return cached
+    image_response = _get_session().get(image_url, stream=True, timeout=15)
+    image_response.raise_for_status()
+    # The GET we need anyway carries the content type; no separate HEAD.
+    content_type = image_response.headers.get('content-type', '').lower()
+    extension = '.png' if 'png' in content_type else '.jpg'
+    filepath = os.path.join(COVERS_DIR, base_name + extension)
+    if _cover_exists(filepath):
+        image_response.close()
+        _record_cover_in_index(base_name, filepath)
+        return filepath
+    # 1 MiB chunks instead of the 16 KiB default: a typical cover is a
+    # few hundred KB, so the copy finishes in a handful of syscalls.
+    with open(filepath, 'wb', buffering=1 << 20) as f:
+        shutil.copyfileobj(image_response.raw, f, length=1 << 20)
+    _verified_covers.add(filepath)
+    _record_cover_in_index(base_name, filepath)
+    logger.info("Saved cover to %s", filepath)
+    return filepath
+
+# Resolved artwork URLs by (artist, album), so repeated scans of the
+# same collection never re-query the search API. Negative results
+# ("album not found") are cached too — they are the ones that repeat.
+_itunes_cache = {}
+
+def download_album_cover(artist, album):
+    """Looks an album up on iTunes and downloads its cover art.
+
+    Returns the local file path of the cover, or None if the album was
+    not found or the download failed.
+    """
+    if requests is None:
+        print("Cover downloads need the 'requests' package (pip install requests).")
+        return None
+    key = (artist.lower(), album.lower())
+    try:
+        if key in _itunes_cache:
+            image_url = _itunes_cache[key]
+        else:
+            response = _get_session().get(ITUNES_SEARCH_URL, params={
+                "term": f"{artist} {album}",
+                "entity": "album",
+                "limit": 1,
+            }, timeout=15)
+            response.raise_for_status()
+            results = response.json().get("results")
+            image_url = results[0].get("artworkUrl100", "") if results else ""
+            # iTunes serves larger artwork at the same URL with a bigger size.
+            image_url = image_url.replace("100x100", "600x600")
+            _itunes_cache[key] = image_url
+        if not image_url:
+            return None
+        return _download_and_save_image(image_url, artist, album)
+    except requests.RequestException as e:
+        logger.warning("Error downloading cover for '%s': %s", album, e)
+        return None
+
+def _prefetch_artist_artwork(artists):
+    """Fills the iTunes cache with one album-list query per artist.
+
+    The search endpoint takes a single term per request, so true request
+    batching is not available; the next best thing is asking for an
+    artist's whole discography at once and matching albums client-side.
+    Albums that do not match anything here simply miss the cache and
+    fall back to their individual lookup.
+    """
+    session = _get_session()
+    for artist in artists:
+        try:
+            response = session.get(ITUNES_SEARCH_URL, params={
+                "term": artist,
+                "entity": "album",
+                "limit": 200,
+            }, timeout=15)
+            response.raise_for_status()
+            results = response.json().get("results", [])
+        except requests.RequestException:
+            continue
+        artist_key = artist.lower()
+        for result in results:
+            image_url = result.get("artworkUrl100", "")
+            key = (artist_key, result.get("collectionName", "").lower())
+            if image_url and key not in _itunes_cache:
+                _itunes_cache[key] = image_url.replace("100x100", "600x600")
+
+# Bounded by iTunes rate limits more than by our CPU; the shared session
+# pools connections, so a handful of workers keeps the pipe full.
+_COVER_WORKERS = 16
+
+# Pause between submissions so a big backlog ramps up instead of
+# slamming the search API with an instantaneous burst; 50 ms caps the
+# request rate at 20/s, far below what a download takes anyway.
+_SUBMIT_STAGGER = 0.05
+
+def find_and_download_missing_covers(collection):
+    """Downloads cover art for every record that has none.
+
+    Each download is dominated by network latency, so the lookups run
+    concurrently on a thread pool over the shared keep-alive session
+    instead of paying one round trip after another.
+    """
+    if requests is None:
+        print("Cover downloads need the 'requests' package (pip install requests).")
+        return
+    _prime_verified_covers()
+    missing = [(index, record) for index, record in enumerate(collection)
+               if not (record.get("cover_path") and _cover_exists(record["cover_path"]))]
+    if not missing:
+        print("Downloaded 0 covers.")
+        return
+    # One discography query covers every missing album by the same
+    # artist; only artists with a single gap pay a per-album search.
+    albums_per_artist = {}
+    for _, record in missing:
+        albums_per_artist.setdefault(record['artist'], []).append(record['album'])
+    _prefetch_artist_artwork(
+        [artist for artist, albums in albums_per_artist.items() if len(albums) > 1])
+    downloaded = 0
+    with ThreadPoolExecutor(max_workers=min(_COVER_WORKERS, len(missing))) as executor:
+        futures = {}
+        for index, record in missing:
+            futures[executor.submit(download_album_cover, record['artist'], record['album'])] = (index, record)
+            time.sleep(_SUBMIT_STAGGER)
+        for future in as_completed(futures):
+            index, record = futures[future]
+            path = future.result()
+            if path:
+                record['cover_path'] = path
+                _append_log({"op": "upd", "index": index, "record": record})
+                downloaded += 1
+    if downloaded:
+        _bump_collection_version()
+    print(f"Downloaded {downloaded} covers.")
+
+# The numbered cover listing, rendered once per collection version; a
+# repeat visit to the menu reuses the cached lines instead of
+# formatting every record again. Kept as a list of lines — writelines
+# consumes it directly, so no second collection-sized string is built.
+_listing_cache = None
+_listing_version = -1
+
+# itemgetter pulls all three fields per record in one C call; records
+# always carry cover_path because load_collection normalizes fields.
+_LISTING_FIELDS = operator.itemgetter('artist', 'album', 'cover_path')
+
+def _get_cover_listing(collection):
+    """Returns the numbered 'Artist - Album (Cover: ...)' listing lines."""
+    global _listing_cache, _listing_version
+    if _listing_cache is None or _listing_version != _collection_version:
+        _listing_cache = [
+            f"{i+1}. {artist} - {album} (Cover: {cover_path or 'None'})\n"
+            for i, (artist, album, cover_path) in enumerate(map(_LISTING_FIELDS, collection))]
+        _listing_version = _collection_version
+    return _listing_cache
+
+def delete_cover(collection):
+    """Removes a record's downloaded cover file and its reference."""
+    if not collection:
+        print("Your collection is empty.")
+        return
+
+    sys.stdout.writelines(_get_cover_listing(collection))
+    index = _read_record_index(collection, "Enter the number of the record whose cover you want to delete: ")
+    if index is None:
+        return
+    record = collection[index]
+    cover_path = record.get("cover_path")
+    if not cover_path:
+        print("That record has no cover.")
+        return
+    if not _yes(f"Delete the cover for '{record['album']}'? (y/n): "):
+        print("Deletion cancelled.")
+        return
+    _verified_covers.discard(cover_path)
+    cover_index = _get_cover_index()
+    stale = [name for name, path in cover_index.items() if path == cover_path]
+    if stale:
+        global _cover_index_dirty
+        for base_name in stale:
+            del cover_index[base_name]
+        _cover_index_dirty = True
+    # EAFP: one unlink syscall instead of stat-then-remove (which also
+    # raced anything deleting the file in between).
+    try:
+        os.remove(cover_path)
+        print(f"Deleted cover file: {cover_path}")
+    except FileNotFoundError:
+        print("Cover file was already missing from disk.")
+    except OSError as e:
+        print(f"Error deleting cover file: {e}")
+        return
+    record["cover_path"] = ""
+    _append_log({"op": "upd", "index": index, "record": record})
+    _bump_collection_version()
+    print(f"Removed cover path from record {index + 1}.")
+
+# HTML escaping as a translation table: one C-level pass per string
+# instead of html.escape's chain of .replace() calls. Same escapes as
+# html.escape(value, quote=True).
+_HTML_ESCAPE_TABLE = str.maketrans({
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+    '"': '&quot;',
+    "'": '&#x27;',
+})
+
+def _escape(value):
+    """HTML-escapes one field value."""
+    return value.translate(_HTML_ESCAPE_TABLE)
+
+# Row template for the HTML export, defined once at module scope so each
+# render only fills in the fields.
+_ROW_TEMPLATE = (
+    "  <li>\n"
+    "{img_line}"
+    "    <strong>Artist:</strong> {artist}<br>\n"
+    "    <strong>Album:</strong> {album}<br>\n"
+    "    <strong>Genre:</strong> {genre}<br>\n"
+    "    <strong>Year:</strong> {year}<br>\n"
+    "    <strong>Format:</strong> {format}<br>\n"
+    "{notes_line}"
+    "  </li>\n"
+)
+
+@functools.lru_cache(maxsize=4096)
+def _relative_cover_path(cover_path):
+    """Path of a cover relative to the HTML file, with forward slashes.
+
+    abspath/relpath normalize paths on every call, which adds up over a
+    large export; each distinct cover pays for it once.
+    """
+    html_dir = os.path.abspath(os.path.dirname(HTML_FILE) or '.')
+    return os.path.relpath(os.path.abspath(cover_path), html_dir).replace("\\", "/")
+
+def _render_row(record):
+    """Renders one record as an HTML list item."""
+    img_line = ""
+    cover_path = record.get('cover_path')
+    if cover_path and _cover_exists(cover_path):
+        img_line = f'    <img src="{_escape(_relative_cover_path(cover_path))}" alt="Album cover" width="100"><br>\n'
+    notes = record['notes']
+    notes_line = f"    <strong>Notes:</strong> {_escape(notes)}<br>\n" if notes else ""
+    return _ROW_TEMPLATE.format_map({
+        'img_line': img_line,
+        'artist': _escape(record['artist']),
+        'album': _escape(record['album']),
+        'genre': _escape(record['genre']),
+        'year': _escape(record['year']),
+        'format': _escape(record['format']),
+        'notes_line': notes_line,
+    })
 
 def generate_html_list(collection):
     """Generates an HTML list of the record collection."""
     if not collection:
         return "<p>Your collection is empty.</p>"
 
-    html_list = "<ul>\n"
+    _prime_verified_covers()
+    # Accumulate fragments in a list and join once at the end; repeated
+    # string += is quadratic in the size of the output.
+    parts = ["<ul>\n"]
     for record in collection:
-        html_list += f"  <li>\n"
-        html_list += f"    <strong>Artist:</strong> {record['artist']}<br>\n"
-        html_list += f"    <strong>Album:</strong> {record['album']}<br>\n"
-        html_list += f"    <strong>Genre:</strong> {record['genre']}<br>\n"
-        html_list += f"    <strong>Year:</strong> {record['year']}<br>\n"
-        html_list += f"    <strong>Format:</strong> {record['format']}<br>\n"
-        if record['notes']:
-            html_list += f"    <strong>Notes:</strong> {record['notes']}<br>\n"
-        html_list += f"  </li>\n"
-    html_list += "</ul>\n"
-    return html_list
+        parts.append(_render_row(record))
+    parts.append("</ul>\n")
+    return "".join(parts)
+
+# Static page chrome, built once at import time instead of being
+# re-concatenated on every export.
+_CSS = """\
+body {
+    font-family: 'Arial', sans-serif;
+    background-color: #f9f9f9;
+    margin: 0;
+    padding: 0;
+}
+h1 {
+    text-align: center;
+    color: #333;
+    padding: 20px 0;
+    border-bottom: 1px solid #ddd;
+}
+ul {
+    list-style-type: none;
+    padding: 0;
+    max-width: 800px;
+    margin: 20px auto;
+}
+li {
+    margin-bottom: 15px;
+    padding-bottom: 15px;
+    border-bottom: 1px solid #eee;
+    background-color: #fff;
+    padding: 15px;
+    border-radius: 8px;
+    box-shadow: 0 2px 4px rgba(0, 0, 0, 0.05);
+    transition: transform 0.2s ease-in-out, box-shadow 0.2s ease-in-out;
+}
+li:hover {
+    transform: translateY(-4px);
+    box-shadow: 0 4px 8px rgba(0, 0, 0, 0.1);
+}
+strong {
+    font-weight: 600;
+    color: #2c3e50;
+}
+p {
+  text-align: center;
+  font-size: 1.1em;
+  color: #666;
+  padding: 10px;
+}
+"""
+
+_HTML_HEAD = f"""\
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Record Collection</title>
+<style>
+{_CSS}</style>
+</head>
+<body>
+    <h1>My Record Collection</h1>
+"""
+
+_HTML_TAIL = "</body>\n</html>\n"
 
 def generate_html_file(collection):
-    """Generates a complete HTML file of the record collection."""
-    html_content = "<!DOCTYPE html>\n"
-    html_content += "<html lang=\"en\">\n"
-    html_content += "<head>\n"
-    html_content += "    <meta charset=\"UTF-8\">\n"
-    html_content += "    <meta name=\"viewport\" content=\"width=device-width, initial-scale=1.0\">\n"
-    html_content += "    <title>Record Collection</title>\n"
-    # Add modern CSS styling
-    html_content += "<style>\n"
-    html_content += "body {\n"
-    html_content += "    font-family: 'Arial', sans-serif;\n"  # More modern font
-    html_content += "    background-color: #f9f9f9;\n"  # Light background
-    html_content += "    margin: 0;\n"
-    html_content += "    padding: 0;\n"
-    html_content += "}\n"
-    html_content += "h1 {\n"
-    html_content += "    text-align: center;\n"
-    html_content += "    color: #333;\n"  # Darker heading color
-    html_content += "    padding: 20px 0;\n"
-    html_content += "    border-bottom: 1px solid #ddd;\n"
-    html_content += "}\n"
-    html_content += "ul {\n"
-    html_content += "    list-style-type: none;\n"
-    html_content += "    padding: 0;\n"
-    html_content += "    max-width: 800px;\n"  # Limit width for better readability
-    html_content += "    margin: 20px auto;\n"  # Center the list
-    html_content += "}\n"
-    html_content += "li {\n"
-    html_content += "    margin-bottom: 15px;\n"
-    html_content += "    padding-bottom: 15px;\n"
-    html_content += "    border-bottom: 1px solid #eee;\n"  # Lighter border
-    html_content += "    background-color: #fff;\n"  # White background for list items
-    html_content += "    padding: 15px;\n"
-    html_content += "    border-radius: 8px;\n"  # Rounded corners for items
-    html_content += "    box-shadow: 0 2px 4px rgba(0, 0, 0, 0.05);\n"  # Subtle shadow
-    html_content += "    transition: transform 0.2s ease-in-out, box-shadow 0.2s ease-in-out;\n" # Smooth transition
-    html_content += "}\n"
-    html_content += "li:hover {\n"
-    html_content += "    transform: translateY(-4px);\n"  # Slight lift on hover
-    html_content += "    box-shadow: 0 4px 8px rgba(0, 0, 0, 0.1);\n"  # Increased shadow on hover
-    html_content += "}\n"
-    html_content += "strong {\n"
-    html_content += "    font-weight: 600;\n"  # Use 600 for a slightly bolder look
-    html_content += "    color: #2c3e50;\n"  # Darker color for strong text
-    html_content += "}\n"
-    html_content += "p {\n"
-    html_content += "  text-align: center;\n"
-    html_content += "  font-size: 1.1em;\n"
-    html_content += "  color: #666;\n"
-    html_content += "  padding: 10px;\n"
-    html_content += "}\n"
-    html_content += "</style>\n"
-    html_content += "</head>\n"
-    html_content += "<body>\n"
-    html_content += "    <h1>My Record Collection</h1>\n"
-    html_content += generate_html_list(collection)
-    html_content += "</body>\n"
-    html_content += "</html>\n"
-    return html_content
+    """Generates a complete HTML file of the record collection.
+
+    The rendered page is cached keyed on the collection version, so
+    repeated exports of an unchanged collection skip the render entirely.
+    """
+    cached = _html_cache.get(_collection_version)
+    if cached is None:
+        cached = _HTML_HEAD + generate_html_list(collection) + _HTML_TAIL
+        # Older versions can never be requested again; keep only the
+        # current render so the cache holds at most one page.
+        _html_cache.clear()
+        _html_cache[_collection_version] = cached
+    return cached
 
 def save_html_file(html_content):
     """Saves the HTML content to a file."""
-    with open(HTML_FILE, "w") as f:
+    # Same write-then-replace dance as the database: a crash mid-write
+    # leaves the old export intact instead of a truncated page.
+    tmp_file = HTML_FILE + ".tmp"
+    with open(tmp_file, "w", encoding="utf-8") as f:
         f.write(html_content)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_file, HTML_FILE)
     print(f"HTML file saved to {HTML_FILE}")
 
+def write_html_file(collection, path=HTML_FILE):
+    """Streams the record collection page straight to the HTML file.
+
+    Unlike generate_html_file + save_html_file, this never materializes
+    the whole page in memory: rows are written through a large buffer as
+    they are rendered, so peak memory stays flat however big the
+    collection is.
+    """
+    _prime_verified_covers()
+    tmp_file = path + ".tmp"
+    with open(tmp_file, "w", encoding="utf-8", buffering=1 << 20) as f:
+        f.write(_HTML_HEAD)
+        if not collection:
+            f.write("<p>Your collection is empty.</p>")
+        else:
+            f.write("<ul>\n")
+            for record in collection:
+                f.write(_render_row(record))
+            f.write("</ul>\n")
+        f.write(_HTML_TAIL)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_file, path)
+    print(f"HTML file saved to {path}")
+
+def _handle_save_exit(collection):
+    save_collection(collection)
+    return True
+
+# Menu choices dispatch through one dict lookup instead of walking an
+# if/elif ladder; every handler takes the collection and a truthy
+# return ends the loop.
+_DISPATCH = {
+    '1': add_record,
+    '1b': add_records_bulk,
+    '2': view_collection,
+    '3': search_collection,
+    '4': edit_record,
+    '5': delete_record,
+    '6': sort_collection_by_artist,
+    '7': write_html_file,
+    '8': find_and_download_missing_covers,
+    '9': delete_cover,
+    '10': _handle_save_exit,
+}
+
 def main():
     """Main function to run the record collection manager."""
+    # Interactive runs keep the progress lines; library use stays quiet
+    # (warnings only) unless the importer configures logging itself.
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     record_collection = load_collection()
+    atexit.register(lambda: flush_collection(record_collection))
 
     while True:
-        print("\n--- Record Collection Manager ---")
-        print("1. Add Record")
-        print("2. View Collection")
-        print("3. Search Collection")
-        print("4. Edit Record")
-        print("5. Delete Record")
-        print("6. Sort Collection by Artist")
-        print("7. Generate HTML File")
-        print("8. Save and Exit")
+        _emit("\n--- Record Collection Manager ---",
+              "1. Add Record",
+              "1b. Bulk Import (CSV)",
+              "2. View Collection",
+              "3. Search Collection",
+              "4. Edit Record",
+              "5. Delete Record",
+              "6. Sort Collection by Artist",
+              "7. Generate HTML File",
+              "8. Find Missing Covers",
+              "9. Delete Cover",
+              "10. Save and Exit")
 
         choice = input("Enter your choice: ").strip()
 
-        if choice == '1':
-            add_record(record_collection)
-        elif choice == '2':
-            view_collection(record_collection)
-        elif choice == '3':
-            search_collection(record_collection)
-        elif choice == '4':
-            edit_record(record_collection)
-        elif choice == '5':
-            delete_record(record_collection)
-        elif choice == '6':
-            record_collection = sort_collection_by_artist(record_collection)
-        elif choice == '7':
-            html_output = generate_html_file(record_collection)
-            save_html_file(html_output)
-        elif choice == '8':
-            save_collection(record_collection)
-            break
-        else:
+        handler = _DISPATCH.get(choice)
+        if handler is None:
             print("Invalid choice. Please try again.")
+        elif handler(record_collection):
+            break
 
 if __name__ == "__main__":
     main()